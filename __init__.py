@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import weakref
+from bisect import bisect_right
+from collections import deque
 from collections.abc import Iterable
+from functools import wraps
 from typing import Any
 
 import aqt
@@ -15,15 +19,20 @@ from aqt.qt import (
     QDialogButtonBox,
     QHBoxLayout,
     QLabel,
+    QListView,
     QListWidget,
     QMenu,
     QModelIndex,
     QPushButton,
+    QTimer,
     QVBoxLayout,
     QWidget,
+    sip,
 )
 
 ADDON_NAME = __name__.split(".")[0]
+# Written alongside the config so already-normalized configs can be trusted on load.
+NORMALIZED_CONFIG_KEY = "_normalized"
 DEFAULT_CONFIG: dict[str, Any] = {
     "hidden_tags": [],
     "show_hide_hint": True,
@@ -36,6 +45,16 @@ HIDE_HINT_TEXT = "Tag hidden. You can unhide tags from Tools > Hidden Tags."
 _tools_menu_action: QAction | None = None
 _installed = False
 _original_tag_tree_builder: Any | None = None
+_config_cache: dict[str, Any] | None = None
+_hidden_tags_cache: frozenset[str] | None = None
+_hidden_ancestors_cache: frozenset[str] | None = None
+_open_browsers: weakref.WeakSet[Browser] = weakref.WeakSet()
+_tag_root_indexes: weakref.WeakKeyDictionary[SidebarTreeView, int] = (
+    weakref.WeakKeyDictionary()
+)
+_tracking_browsers = False
+_refresh_pending = False
+_pending_sidebars: weakref.WeakSet[SidebarTreeView] = weakref.WeakSet()
 
 
 def _normalize_hidden_tags(values: Iterable[Any]) -> list[str]:
@@ -65,36 +84,101 @@ def _normalize_config(raw_config: Any) -> dict[str, Any]:
     }
 
 
-def _load_config() -> dict[str, Any]:
-    if aqt.mw is None:
-        return dict(DEFAULT_CONFIG)
+def _copy_config(config: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "hidden_tags": list(config["hidden_tags"]),
+        "show_hide_hint": config["show_hide_hint"],
+    }
 
-    raw_config = aqt.mw.addonManager.getConfig(ADDON_NAME)
-    config = _normalize_config(raw_config)
 
-    # Keep on-disk config normalized so persistence is predictable.
-    if raw_config != config:
-        _save_config(config)
+def _hidden_tag_ancestors(hidden_tags: Iterable[str]) -> frozenset[str]:
+    ancestors: set[str] = set()
+    for tag in hidden_tags:
+        parts = tag.split("::")
+        for depth in range(1, len(parts)):
+            ancestors.add("::".join(parts[:depth]))
+    return frozenset(ancestors)
+
+
+def _set_config_cache(config: dict[str, Any]) -> None:
+    global _config_cache, _hidden_tags_cache, _hidden_ancestors_cache
+
+    _config_cache = _copy_config(config)
+    _hidden_tags_cache = frozenset(_config_cache["hidden_tags"])
+    _hidden_ancestors_cache = _hidden_tag_ancestors(_hidden_tags_cache)
+
+
+def _is_normalized_config(raw_config: Any) -> bool:
+    if not isinstance(raw_config, dict):
+        return False
+    if raw_config.get(NORMALIZED_CONFIG_KEY) is not True:
+        return False
+
+    hidden_tags = raw_config.get("hidden_tags")
+    if not isinstance(hidden_tags, list):
+        return False
+
+    # The marker survives hand edits, so still reject entries that need cleanup.
+    if not all(
+        isinstance(tag, str) and tag and tag == tag.strip() for tag in hidden_tags
+    ):
+        return False
+    if len(set(hidden_tags)) != len(hidden_tags):
+        return False
+
+    # Sorted inserts in _add_hidden_tag rely on the stored casefold order.
+    sort_keys = [tag.casefold() for tag in hidden_tags]
+    return all(key <= next_key for key, next_key in zip(sort_keys, sort_keys[1:]))
+
 
-    return config
+def _load_config() -> dict[str, Any]:
+    if aqt.mw is None:
+        return _copy_config(DEFAULT_CONFIG)
+
+    if _config_cache is None:
+        raw_config = aqt.mw.addonManager.getConfig(ADDON_NAME)
+        if _is_normalized_config(raw_config):
+            # Configs written by this add-on are already normalized.
+            _set_config_cache(
+                {
+                    "hidden_tags": raw_config["hidden_tags"],
+                    "show_hide_hint": bool(raw_config.get("show_hide_hint", True)),
+                }
+            )
+        else:
+            # Keep on-disk config normalized so persistence is predictable.
+            _save_config(_normalize_config(raw_config))
+
+    # Callers mutate the returned config before saving, so hand out a copy.
+    return _copy_config(_config_cache)
 
 
 def _save_config(config: dict[str, Any]) -> None:
     if aqt.mw is None:
         return
 
+    _set_config_cache(config)
+
     # Persist hidden tags and hint preference via add-on config.
-    aqt.mw.addonManager.writeConfig(ADDON_NAME, config)
+    aqt.mw.addonManager.writeConfig(ADDON_NAME, {**config, NORMALIZED_CONFIG_KEY: True})
+
+
+def _on_config_updated(raw_config: Any) -> None:
+    # Edits from Anki's config editor are not trusted to be normalized.
+    _save_config(_normalize_config(raw_config))
+    _schedule_sidebar_refresh()
 
 
 def _add_hidden_tag(full_tag_path: str) -> bool:
-    config = _load_config()
-    hidden_tags: list[str] = config["hidden_tags"]
-    if full_tag_path in hidden_tags:
+    tag = full_tag_path.strip()
+    if not tag or tag in _hidden_tags_set():
         return False
 
-    hidden_tags.append(full_tag_path)
-    config["hidden_tags"] = _normalize_hidden_tags(hidden_tags)
+    config = _load_config()
+    hidden_tags: list[str] = config["hidden_tags"]
+    # The stored list is already normalized, so a sorted insert keeps it that way.
+    sort_keys = [hidden_tag.casefold() for hidden_tag in hidden_tags]
+    hidden_tags.insert(bisect_right(sort_keys, tag.casefold()), tag)
     _save_config(config)
     return True
 
@@ -104,13 +188,19 @@ def _remove_hidden_tags(tags_to_remove: Iterable[str]) -> bool:
     if not tags_to_remove_set:
         return False
 
-    config = _load_config()
-    hidden_tags: list[str] = config["hidden_tags"]
-    updated = [tag for tag in hidden_tags if tag not in tags_to_remove_set]
-    if len(updated) == len(hidden_tags):
+    removed = tags_to_remove_set & _hidden_tags_set()
+    if not removed:
         return False
 
-    config["hidden_tags"] = updated
+    config = _load_config()
+    hidden_tags: list[str] = config["hidden_tags"]
+    if len(removed) == len(hidden_tags):
+        config["hidden_tags"] = []
+    elif len(removed) == 1:
+        hidden_tags.remove(next(iter(removed)))
+    else:
+        # Filter rather than re-sort so the stored order stays stable.
+        config["hidden_tags"] = [tag for tag in hidden_tags if tag not in removed]
     _save_config(config)
     return True
 
@@ -125,11 +215,27 @@ def _clear_hidden_tags() -> bool:
     return True
 
 
-def _hidden_tags_set() -> set[str]:
-    return set(_load_config()["hidden_tags"])
+def _hidden_tags_set() -> frozenset[str]:
+    if _hidden_tags_cache is None:
+        _load_config()
+    return _hidden_tags_cache or frozenset()
+
+
+def _hidden_ancestors_set() -> frozenset[str]:
+    if _hidden_ancestors_cache is None:
+        _load_config()
+    return _hidden_ancestors_cache or frozenset()
+
+
+def _on_browser_will_show(browser: Browser) -> None:
+    _open_browsers.add(browser)
 
 
 def _iter_open_browsers() -> list[Browser]:
+    if _tracking_browsers:
+        # Closed browsers are deleteLater()'d but can linger here until collected.
+        return [browser for browser in _open_browsers if not sip.isdeleted(browser)]
+
     app = QApplication.instance()
     if app is None:
         return []
@@ -138,13 +244,38 @@ def _iter_open_browsers() -> list[Browser]:
 
 
 def _refresh_open_browser_sidebars() -> None:
-    # Refresh Browser sidebars after hide/unhide so changes are visible immediately.
+    global _refresh_pending
+
+    _refresh_pending = False
+    sidebars = list(_pending_sidebars)
+    _pending_sidebars.clear()
+
     for browser in _iter_open_browsers():
         sidebar = getattr(browser, "sidebar", None)
-        if sidebar is not None:
+        if sidebar is not None and sidebar not in sidebars:
+            sidebars.append(sidebar)
+
+    # Refresh Browser sidebars after hide/unhide so changes are visible immediately.
+    for sidebar in sidebars:
+        if not sip.isdeleted(sidebar):
             sidebar.refresh()
 
 
+def _schedule_sidebar_refresh(sidebar: SidebarTreeView | None = None) -> None:
+    global _refresh_pending
+
+    # Include the sidebar the change came from even if its Browser is untracked.
+    if sidebar is not None:
+        _pending_sidebars.add(sidebar)
+
+    if _refresh_pending:
+        return
+
+    # Coalesce changes made in the same event loop pass into one sidebar rebuild.
+    _refresh_pending = True
+    QTimer.singleShot(0, _refresh_open_browser_sidebars)
+
+
 def _maybe_show_hide_hint_once(parent: QWidget | None = None) -> None:
     config = _load_config()
     if not config["show_hide_hint"]:
@@ -174,32 +305,88 @@ def _hide_sidebar_tag(sidebar: SidebarTreeView, full_tag_path: str) -> None:
         return
 
     if _add_hidden_tag(full_tag_path):
-        sidebar.refresh()
-        _refresh_open_browser_sidebars()
+        _schedule_sidebar_refresh(sidebar)
         _maybe_show_hide_hint_once(parent=sidebar)
 
 
-def _filter_hidden_tags_recursive(parent: SidebarItem, hidden_tags: set[str]) -> None:
-    filtered_children: list[SidebarItem] = []
-
-    for child in parent.children:
-        if child.item_type == SidebarItemType.TAG and child.full_name in hidden_tags:
-            continue
-        _filter_hidden_tags_recursive(child, hidden_tags)
-        filtered_children.append(child)
-
-    parent.children = filtered_children
-
-
-def _filter_hidden_tags_in_tree(tree: SidebarItem, hidden_tags: set[str]) -> None:
-    for section in tree.children:
-        if section.item_type != SidebarItemType.TAG_ROOT:
-            continue
-
-        # Filter the tag branch while the sidebar tree is being built.
-        _filter_hidden_tags_recursive(section, hidden_tags)
+def _filter_hidden_tags_in_section(
+    section: SidebarItem,
+    hidden_tags: frozenset[str],
+    hidden_ancestors: frozenset[str],
+) -> None:
+    remaining = set(hidden_tags)
+
+    # Bind lookups to locals; this loop runs for every sidebar rebuild.
+    tag_type = SidebarItemType.TAG
+    is_hidden = hidden_tags.__contains__
+    is_remaining = remaining.__contains__
+    discard_remaining = remaining.discard
+    leads_to_hidden = hidden_ancestors.__contains__
+
+    # Walk iteratively so deep tag hierarchies cannot hit the recursion limit.
+    stack: deque[SidebarItem] = deque([section])
+    stack_pop = stack.pop
+    stack_append = stack.append
+    while stack and remaining:
+        children = stack_pop().children
+        hidden_child: SidebarItem | None = None
+        hidden_count = 0
+        for child in children:
+            full_name = child.full_name
+            if child.item_type is tag_type and is_remaining(full_name):
+                discard_remaining(full_name)
+                hidden_child = child
+                hidden_count += 1
+            elif leads_to_hidden(full_name):
+                # Only descend into branches that lead to a hidden tag.
+                stack_append(child)
+
+        if hidden_count == 1:
+            # A single hidden child is removed in place without a new list.
+            children.remove(hidden_child)
+        elif hidden_count:
+            children[:] = [
+                child
+                for child in children
+                if not (child.item_type is tag_type and is_hidden(child.full_name))
+            ]
+
+
+def _find_tag_root_section(
+    sidebar: SidebarTreeView, tree: SidebarItem
+) -> SidebarItem | None:
+    sections = tree.children
+
+    # Sidebar section order is stable, so reuse the last known tag section index.
+    index = _tag_root_indexes.get(sidebar)
+    if (
+        index is not None
+        and index < len(sections)
+        and sections[index].item_type is SidebarItemType.TAG_ROOT
+    ):
+        return sections[index]
+
+    for index, section in enumerate(sections):
+        if section.item_type is SidebarItemType.TAG_ROOT:
+            _tag_root_indexes[sidebar] = index
+            return section
+
+    return None
+
+
+def _filter_hidden_tags_in_tree(
+    sidebar: SidebarTreeView,
+    tree: SidebarItem,
+    hidden_tags: frozenset[str],
+    hidden_ancestors: frozenset[str],
+) -> None:
+    section = _find_tag_root_section(sidebar, tree)
+    if section is None:
         return
 
+    # Filter the tag branch while the sidebar tree is being built.
+    _filter_hidden_tags_in_section(section, hidden_tags, hidden_ancestors)
+
 
 def _patch_sidebar_tag_tree_builder() -> None:
     global _original_tag_tree_builder
@@ -213,12 +400,16 @@ def _patch_sidebar_tag_tree_builder() -> None:
 
     _original_tag_tree_builder = original
 
+    # Filter the tree Anki's own builder produced rather than building it again.
+    @wraps(original)
     def wrapped_tag_tree(sidebar: SidebarTreeView, root: SidebarItem) -> None:
         _original_tag_tree_builder(sidebar, root)
         hidden_tags = _hidden_tags_set()
         if hidden_tags:
             # Filter hidden tags every time Anki rebuilds the sidebar tag tree.
-            _filter_hidden_tags_in_tree(root, hidden_tags)
+            _filter_hidden_tags_in_tree(
+                sidebar, root, hidden_tags, _hidden_ancestors_set()
+            )
 
     SidebarTreeView._tag_tree = wrapped_tag_tree
 
@@ -255,6 +446,9 @@ class HiddenTagsDialog(QDialog):
         self.list_widget.setSelectionMode(
             QAbstractItemView.SelectionMode.ExtendedSelection
         )
+        # Lay out large hidden tag lists in batches of uniformly sized rows.
+        self.list_widget.setUniformItemSizes(True)
+        self.list_widget.setLayoutMode(QListView.LayoutMode.Batched)
         self.list_widget.itemSelectionChanged.connect(self._update_button_state)
         layout.addWidget(self.list_widget)
 
@@ -275,27 +469,29 @@ class HiddenTagsDialog(QDialog):
         self._refresh_list()
 
     def _refresh_list(self) -> None:
+        self.list_widget.setUpdatesEnabled(False)
         self.list_widget.clear()
-        for tag in _load_config()["hidden_tags"]:
-            self.list_widget.addItem(tag)
+        self.list_widget.addItems(_load_config()["hidden_tags"])
+        self.list_widget.setUpdatesEnabled(True)
 
         self._update_button_state()
 
     def _update_button_state(self) -> None:
         has_items = self.list_widget.count() > 0
-        has_selection = len(self.list_widget.selectedItems()) > 0
+        # Avoid materializing the selected items on every selection change.
+        has_selection = self.list_widget.selectionModel().hasSelection()
         self.unhide_selected_button.setEnabled(has_selection)
         self.unhide_all_button.setEnabled(has_items)
 
     def _unhide_selected(self) -> None:
         selected_tags = [item.text() for item in self.list_widget.selectedItems()]
         if _remove_hidden_tags(selected_tags):
-            _refresh_open_browser_sidebars()
+            _schedule_sidebar_refresh()
         self._refresh_list()
 
     def _unhide_all(self) -> None:
         if _clear_hidden_tags():
-            _refresh_open_browser_sidebars()
+            _schedule_sidebar_refresh()
         self._refresh_list()
 
 
@@ -319,13 +515,16 @@ def _add_tools_menu_entry() -> None:
 
 
 def _install_hooks() -> None:
-    global _installed
+    global _installed, _tracking_browsers
 
     if _installed:
         return
 
     _patch_sidebar_tag_tree_builder()
 
+    if aqt.mw is not None:
+        aqt.mw.addonManager.setConfigUpdatedAction(ADDON_NAME, _on_config_updated)
+
     if hasattr(gui_hooks, "main_window_did_init"):
         gui_hooks.main_window_did_init.append(_add_tools_menu_entry)
     else:
@@ -334,6 +533,11 @@ def _install_hooks() -> None:
     if hasattr(gui_hooks, "browser_sidebar_will_show_context_menu"):
         gui_hooks.browser_sidebar_will_show_context_menu.append(_on_sidebar_context_menu)
 
+    if hasattr(gui_hooks, "browser_will_show"):
+        # Track Browser windows as they open instead of scanning top-level widgets.
+        gui_hooks.browser_will_show.append(_on_browser_will_show)
+        _tracking_browsers = True
+
     _installed = True
 
 